@@ -1,13 +1,16 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from streamlit_folium import folium_static
-from geopy.distance import geodesic
 
-from utils.data_loader import load_data
+# Prefer numba's OpenMP threading layer, it must be chosen before numba is imported. Under TBB
+# the process can hang at exit after kernels were launched from Streamlit's session threads
+os.environ.setdefault('NUMBA_THREADING_LAYER_PRIORITY', 'omp tbb workqueue')
+
+from utils.data_loader import CARGO_DTYPES, TRUCKS_DTYPES, load_data, read_csv_bytes
 from utils.time_cost_calculator import optimize_assignments
-from utils.visualization import create_map
 from utils.time_cost_calculator import TimeCostCalculator, calculate_total_metrics
 
 
@@ -108,8 +111,8 @@ def main():
     # Load and validate data
     if trucks_file is not None and cargo_file is not None:
         try:
-            trucks_df = pd.read_csv(trucks_file)
-            cargo_df = pd.read_csv(cargo_file)
+            trucks_df = read_csv_bytes(trucks_file.getvalue(), TRUCKS_DTYPES)
+            cargo_df = read_csv_bytes(cargo_file.getvalue(), CARGO_DTYPES)
 
             # Data validation
             required_truck_columns = [
@@ -156,7 +159,7 @@ def main():
                 calculator = TimeCostCalculator(standard_speed_kmh=standard_speed)
 
                 # Calculate optimized assignments
-                assignments, time_info, rejection_info = optimize_assignments(
+                assignments, time_info, rejection_info, pair_metrics = optimize_assignments(
                     trucks_df,
                     cargo_df,
                     max_distance_km=250,  # Add default restrictions
@@ -164,7 +167,9 @@ def main():
                 )
 
                 if assignments:
-                    display_results(trucks_df, cargo_df, assignments, time_info, rejection_info, show_debug)
+                    display_results(
+                        trucks_df, cargo_df, assignments, time_info, rejection_info, pair_metrics, show_debug
+                    )
                 else:
                     st.error("❌ No valid assignments could be made.")
 
@@ -210,11 +215,11 @@ def main():
         show_welcome_message()
 
 
-def display_results(trucks_df, cargo_df, assignments, time_info, rejection_info, show_debug):
+def display_results(trucks_df, cargo_df, assignments, time_info, rejection_info, pair_metrics, show_debug):
     """Display optimization results with detailed information"""
 
     # Calculate metrics using the updated function
-    metrics = calculate_total_metrics(assignments, time_info, rejection_info)
+    metrics = calculate_total_metrics(assignments, pair_metrics, rejection_info)
 
     # Display main metrics
     st.header("📊 Optimization Results")
@@ -238,9 +243,9 @@ def display_results(trucks_df, cargo_df, assignments, time_info, rejection_info,
     st.subheader("📋 Detailed Assignments")
 
     assignments_data = []
-    for truck_idx, cargo_idx in assignments:
-        truck = trucks_df.iloc[truck_idx]
-        cargo = cargo_df.iloc[cargo_idx]
+    truck_rows = trucks_df.iloc[[truck_idx for truck_idx, _ in assignments]].to_dict('records')
+    cargo_rows = cargo_df.iloc[[cargo_idx for _, cargo_idx in assignments]].to_dict('records')
+    for (truck_idx, cargo_idx), truck, cargo in zip(assignments, truck_rows, cargo_rows):
         info = time_info[(truck_idx, cargo_idx)]
 
         assignments_data.append({
@@ -272,7 +277,10 @@ def display_results(trucks_df, cargo_df, assignments, time_info, rejection_info,
         mime="text/csv"
     )
 
-    # Display map
+    # Display map, folium is only imported once there is a map to render
+    from streamlit_folium import folium_static
+    from utils.visualization import create_map
+
     st.header("🗺️ Map Visualization")
     map_obj = create_map(trucks_df, cargo_df, assignments, time_info)
     folium_static(map_obj)
@@ -0,0 +1,47 @@
+# utils/assignment.py
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+try:
+    import lap
+except ImportError:
+    lap = None
+
+# From this size on, Jonker-Volgenant (lap.lapjv) is faster than SciPy on dense matrices
+LAPJV_MIN_SIZE = 256
+
+
+def _solve_finite(cost):
+    """Solve the assignment problem for a cost matrix without infinite entries"""
+    if lap is not None and max(cost.shape) >= LAPJV_MIN_SIZE:
+        _, row_to_col, _ = lap.lapjv(cost, extend_cost=True)
+        return [(r, c) for r, c in enumerate(row_to_col) if c >= 0]
+
+    row_ind, col_ind = linear_sum_assignment(cost)
+    return list(zip(row_ind, col_ind))
+
+
+def solve_assignment(cost_matrix):
+    """
+    Solve the linear assignment problem for a (possibly rectangular) cost matrix
+
+    Args:
+        cost_matrix: (N, M) array of costs, np.inf marks pairs that cannot be assigned
+
+    Returns:
+        List of (row_idx, col_idx) tuples, infeasible pairs are never returned
+    """
+    feasible = np.isfinite(cost_matrix)
+
+    # Every pair is assignable (typically balanced, pre-matched data), so the
+    # solution needs neither sentinel costs nor filtering
+    if feasible.all():
+        return _solve_finite(cost_matrix)
+
+    # Infeasible pairs get a cost above any sum of feasible ones, so the solvers still
+    # maximise the number of real assignments. Kept as small as possible because
+    # lapjv loses precision with huge sentinels such as 1e10.
+    infeasible_cost = cost_matrix[feasible].sum() + 1
+    cost = np.where(feasible, cost_matrix, infeasible_cost)
+
+    return [(r, c) for r, c in _solve_finite(cost) if feasible[r, c]]
@@ -1,8 +1,50 @@
+import io
+
 import streamlit as st
 import pandas as pd
 from datetime import datetime
 import numpy as np
 
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError:
+    pyarrow = None
+
+# Parse with the multithreaded Arrow reader and keep text columns as Arrow strings when available
+STRING_DTYPE = 'string[pyarrow]' if pyarrow is not None else 'string'
+
+# Text columns of the uploaded files, numeric columns are validated and converted after parsing.
+# Timestamps stay text as well, Arrow would otherwise convert values with a UTC offset to UTC
+TRUCKS_DTYPES = {
+    'truck type': STRING_DTYPE,
+    'Address (drop off)': STRING_DTYPE,
+    'Timestamp (dropoff)': STRING_DTYPE
+}
+CARGO_DTYPES = {
+    'Origin': STRING_DTYPE,
+    'Delivery_Location': STRING_DTYPE,
+    'Cargo_Type': STRING_DTYPE,
+    'Available_From': STRING_DTYPE,
+    'Available_To': STRING_DTYPE
+}
+
+
+@st.cache_data(show_spinner=False)
+def read_csv_bytes(file_bytes, dtype=None):
+    """Parse uploaded CSV contents, cached per unique file contents and column dtypes"""
+    if pyarrow is None:
+        return pd.read_csv(io.BytesIO(file_bytes), dtype=dtype)
+
+    # The columns are declared as text to Arrow itself, pandas' engine='pyarrow' only applies
+    # dtype after inference has already converted offset timestamps to UTC
+    dtype = dtype or {}
+    table = pyarrow.csv.read_csv(
+        io.BytesIO(file_bytes),
+        convert_options=pyarrow.csv.ConvertOptions(column_types={col: pyarrow.string() for col in dtype})
+    )
+    df = table.to_pandas()
+    return df.astype({col: col_dtype for col, col_dtype in dtype.items() if col in df.columns})
 
 class DataValidator:
     """Class to handle data validation rules and checks"""
@@ -60,7 +102,7 @@ class DataLoader:
         """
         try:
             # Read CSV file
-            df = pd.read_csv(file)
+            df = read_csv_bytes(file.getvalue(), TRUCKS_DTYPES)
 
             # Check required columns
             required_columns = [
@@ -88,23 +130,19 @@ class DataLoader:
                 validation_errors.append("Duplicate truck IDs found")
 
             # Validate coordinates
-            invalid_coords = df.apply(
-                lambda row: not self.validator.validate_coordinates(
-                    row['Latitude (dropoff)'],
-                    row['Longitude (dropoff)']
-                ),
-                axis=1
-            )
+            invalid_coords = np.array([
+                not self.validator.validate_coordinates(lat, lon)
+                for lat, lon in zip(df['Latitude (dropoff)'], df['Longitude (dropoff)'])
+            ], dtype=bool)
             if invalid_coords.any():
                 validation_errors.append(
                     f"Invalid coordinates found in rows: {list(df[invalid_coords].index)}"
                 )
 
             # Validate timestamp
-            invalid_timestamps = df.apply(
-                lambda row: not self.validator.validate_timestamp(row['Timestamp (dropoff)']),
-                axis=1
-            )
+            invalid_timestamps = np.array([
+                not self.validator.validate_timestamp(value) for value in df['Timestamp (dropoff)']
+            ], dtype=bool)
             if invalid_timestamps.any():
                 validation_errors.append(
                     f"Invalid timestamps found in rows: {list(df[invalid_timestamps].index)}"
@@ -118,10 +156,9 @@ class DataLoader:
             ]
 
             for col in numeric_columns:
-                invalid_numbers = df.apply(
-                    lambda row: not self.validator.validate_numeric(row[col]),
-                    axis=1
-                )
+                invalid_numbers = np.array([
+                    not self.validator.validate_numeric(value) for value in df[col]
+                ], dtype=bool)
                 if invalid_numbers.any():
                     validation_errors.append(
                         f"Invalid {col} values found in rows: {list(df[invalid_numbers].index)}"
@@ -168,7 +205,7 @@ class DataLoader:
         """
         try:
             # Read CSV file
-            df = pd.read_csv(file)
+            df = read_csv_bytes(file.getvalue(), CARGO_DTYPES)
 
             # Check required columns
             required_columns = [
@@ -192,45 +229,37 @@ class DataLoader:
             validation_errors = []
 
             # Validate origin coordinates
-            invalid_origin_coords = df.apply(
-                lambda row: not self.validator.validate_coordinates(
-                    row['Origin_Latitude'],
-                    row['Origin_Longitude']
-                ),
-                axis=1
-            )
+            invalid_origin_coords = np.array([
+                not self.validator.validate_coordinates(lat, lon)
+                for lat, lon in zip(df['Origin_Latitude'], df['Origin_Longitude'])
+            ], dtype=bool)
             if invalid_origin_coords.any():
                 validation_errors.append(
                     f"Invalid origin coordinates found in rows: {list(df[invalid_origin_coords].index)}"
                 )
 
             # Validate delivery coordinates
-            invalid_delivery_coords = df.apply(
-                lambda row: not self.validator.validate_coordinates(
-                    row['Delivery_Latitude'],
-                    row['Delivery_Longitude']
-                ),
-                axis=1
-            )
+            invalid_delivery_coords = np.array([
+                not self.validator.validate_coordinates(lat, lon)
+                for lat, lon in zip(df['Delivery_Latitude'], df['Delivery_Longitude'])
+            ], dtype=bool)
             if invalid_delivery_coords.any():
                 validation_errors.append(
                     f"Invalid delivery coordinates found in rows: {list(df[invalid_delivery_coords].index)}"
                 )
 
             # Validate timestamps
-            invalid_from_times = df.apply(
-                lambda row: not self.validator.validate_timestamp(row['Available_From']),
-                axis=1
-            )
+            invalid_from_times = np.array([
+                not self.validator.validate_timestamp(value) for value in df['Available_From']
+            ], dtype=bool)
             if invalid_from_times.any():
                 validation_errors.append(
                     f"Invalid Available_From timestamps found in rows: {list(df[invalid_from_times].index)}"
                 )
 
-            invalid_to_times = df.apply(
-                lambda row: not self.validator.validate_timestamp(row['Available_To']),
-                axis=1
-            )
+            invalid_to_times = np.array([
+                not self.validator.validate_timestamp(value) for value in df['Available_To']
+            ], dtype=bool)
             if invalid_to_times.any():
                 validation_errors.append(
                     f"Invalid Available_To timestamps found in rows: {list(df[invalid_to_times].index)}"
@@ -0,0 +1,74 @@
+# utils/distance.py
+import numpy as np
+from scipy.spatial.distance import cdist
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Use the equirectangular approximation instead of haversine for short distances,
+# pairs further apart than FAST_APPROX_MAX_KM always fall back to haversine
+FAST_APPROX = True
+FAST_APPROX_MAX_KM = 500.0
+
+
+def radian_coordinates(lat, lon):
+    """
+    Convert a set of points to the form used by every distance path
+
+    Args:
+        lat, lon: Latitudes/longitudes of the points (degrees)
+
+    Returns:
+        (lat, lon, cos_lat) arrays, coordinates in radians
+    """
+    lat = np.deg2rad(np.asarray(lat, dtype=np.float64))
+    lon = np.deg2rad(np.asarray(lon, dtype=np.float64))
+    return lat, lon, np.cos(lat)
+
+
+def unit_vectors(lat, lon, cos_lat=None):
+    """(N, 3) Cartesian coordinates on the unit sphere for points given in radians"""
+    if cos_lat is None:
+        cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_matrix_radians(lat1, lon1, lat2, lon2, cos_lat1=None, cos_lat2=None):
+    """
+    Great-circle distances (km) from chord lengths on the unit sphere
+
+    Gives the same distances as the haversine formula, but the pairwise work is a
+    single Euclidean cdist over 3-D points followed by one arcsin per pair.
+    """
+    chord = cdist(unit_vectors(lat1, lon1, cos_lat1), unit_vectors(lat2, lon2, cos_lat2))
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0.0, 1.0))
+
+
+def distance_matrix_radians(lat1, lon1, lat2, lon2, fast_approx=None, cos_lat1=None, cos_lat2=None):
+    """
+    Distances (km) between two sets of points given in radians
+
+    Follows the distance rules of the numba cost kernel: with fast_approx (default
+    FAST_APPROX) the equirectangular approximation is used and pairs further apart than
+    FAST_APPROX_MAX_KM are recomputed with haversine. Without the approximation the
+    exact distances come from chord_matrix_radians.
+    """
+    if cos_lat1 is None:
+        cos_lat1 = np.cos(lat1)
+    if cos_lat2 is None:
+        cos_lat2 = np.cos(lat2)
+    if fast_approx is None:
+        fast_approx = FAST_APPROX
+    if not fast_approx:
+        return chord_matrix_radians(lat1, lon1, lat2, lon2, cos_lat1, cos_lat2)
+
+    # cos(mean latitude) is approximated by the mean of the per-point cosines
+    x = (lon2[None, :] - lon1[:, None]) * (0.5 * (cos_lat1[:, None] + cos_lat2[None, :]))
+    y = lat2[None, :] - lat1[:, None]
+    distances = EARTH_RADIUS_KM * np.sqrt(x * x + y * y)
+
+    rows, cols = np.nonzero(distances > FAST_APPROX_MAX_KM)
+    if rows.size:
+        a = (np.sin((lat2[cols] - lat1[rows]) / 2) ** 2
+             + cos_lat1[rows] * cos_lat2[cols] * np.sin((lon2[cols] - lon1[rows]) / 2) ** 2)
+        distances[rows, cols] = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return distances
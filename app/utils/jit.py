@@ -0,0 +1,36 @@
+# utils/jit.py
+import functools
+import threading
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Whether kernels decorated with parallel_njit are actually compiled
+JIT_AVAILABLE = numba is not None
+
+# Parallel loop range, plain range when numba is not installed
+prange = numba.prange if numba is not None else range
+
+# Streamlit launches kernels from one thread per session, numba's workqueue layer (used when
+# neither OpenMP nor TBB is installed) aborts the process on concurrent launches
+_launch_lock = threading.Lock()
+
+
+def parallel_njit(func):
+    """
+    Compile a kernel with numba when it is installed, otherwise run it as plain Python
+
+    Launches of compiled kernels are serialised, each launch already uses every core.
+    """
+    if numba is None:
+        return func
+    kernel = numba.njit(parallel=True, cache=True)(func)
+
+    @functools.wraps(func)
+    def launch(*args):
+        with _launch_lock:
+            return kernel(*args)
+
+    return launch
@@ -1,10 +1,26 @@
 # optimizer.py
 import numpy as np
 import pandas as pd
-from scipy.optimize import linear_sum_assignment
-from geopy.distance import geodesic
+import streamlit as st
 from datetime import datetime, timedelta
 
+from utils.assignment import solve_assignment
+from utils.distance import (
+    EARTH_RADIUS_KM,
+    FAST_APPROX,
+    FAST_APPROX_MAX_KM,
+    distance_matrix_radians,
+    radian_coordinates
+)
+from utils.jit import JIT_AVAILABLE, parallel_njit, prange
+
+# Outcome of a truck/cargo pairing as computed by the cost kernel
+STATUS_TYPE_MISMATCH = 0
+STATUS_VALID = 1
+STATUS_TOO_FAR = 2
+STATUS_WINDOW_MISSED = 3
+STATUS_WAIT_TOO_LONG = 4
+
 class TimeCostCalculator:
     def __init__(self, standard_speed_kmh=73, max_distance_km=250, max_waiting_hours=24):
         self.standard_speed_kmh = standard_speed_kmh
@@ -15,157 +31,318 @@ class TimeCostCalculator:
         """Calculate travel time in hours based on distance"""
         return distance / self.standard_speed_kmh
 
-    def calculate_pickup_possibilities(self, truck_available_from, distance, cargo_available_from, cargo_available_to):
-        """
-        Calculate possible pickup time based on when truck becomes available and cargo time window.
-
-        Args:
-            truck_available_from: When truck becomes available (previous dropoff time)
-            distance: Distance to cargo location
-            cargo_available_from: Start of cargo pickup window
-            cargo_available_to: End of cargo pickup window
-
-        Returns:
-            (is_valid, pickup_time, waiting_hours, rejection_reason)
-        """
-        # Check distance restriction first
-        if distance > self.max_distance_km:
-            return False, None, 0, f"Distance ({distance:.1f} km) exceeds maximum allowed ({self.max_distance_km} km)"
-
-        # Convert all times to pandas datetime
-        truck_available = pd.to_datetime(truck_available_from)
-        cargo_from = pd.to_datetime(cargo_available_from)
-        cargo_to = pd.to_datetime(cargo_available_to)
-
-        # Calculate how long it takes to reach cargo location
-        travel_to_cargo = pd.Timedelta(hours=self.calculate_travel_time(distance))
-
-        # Earliest possible time truck can reach cargo location
-        earliest_possible_arrival = truck_available + travel_to_cargo
-
-        # If truck can't reach cargo before the pickup window ends
-        if earliest_possible_arrival > cargo_to:
-            return False, None, 0, "Truck arrives after cargo available window ends"
-
-        # If truck arrives before cargo is available, it must wait
-        if earliest_possible_arrival < cargo_from:
-            waiting_hours = (cargo_from - earliest_possible_arrival).total_seconds() / 3600
-            if waiting_hours > self.max_waiting_hours:
-                return False, None, 0, f"Waiting time ({waiting_hours:.1f} h) exceeds maximum allowed ({self.max_waiting_hours} h)"
-            pickup_time = cargo_from
-        else:
-            waiting_hours = 0
-            pickup_time = earliest_possible_arrival
-
-        return True, pickup_time, waiting_hours, "Valid assignment"
+    def rejection_reason(self, status, distance, waiting_hours):
+        """Describe why a pairing with the given kernel status was rejected"""
+        if status == STATUS_TOO_FAR:
+            return f"Distance ({distance:.1f} km) exceeds maximum allowed ({self.max_distance_km} km)"
+        if status == STATUS_WINDOW_MISSED:
+            return "Truck arrives after cargo available window ends"
+        if status == STATUS_WAIT_TOO_LONG:
+            return f"Waiting time ({waiting_hours:.1f} h) exceeds maximum allowed ({self.max_waiting_hours} h)"
+        return "Valid assignment"
+
+
+def _parse_timestamps(values):
+    """
+    Parse a column of timestamps once into a datetime64[ns] array of UTC times
+
+    Text values may mix formats. Values with a UTC offset are converted to UTC so that
+    times from different offsets compare as instants, values without one are taken as UTC.
+    """
+    timestamps = pd.to_datetime(pd.Series(values), format='mixed', utc=True)
+    return timestamps.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]')
+
+
+def _to_epoch_seconds(timestamps):
+    """Convert a datetime64 array into int64 seconds since the epoch"""
+    return timestamps.astype('datetime64[s]').astype(np.int64)
+
+
+@parallel_njit
+def _cost_kernel(t_lat, t_lon, t_cos_lat, t_ppk, t_pwh, t_type, t_drop_sec,
+                 c_lat, c_lon, c_cos_lat, c_type, c_from_sec, c_to_sec,
+                 speed_kmh, max_distance_km, max_waiting_hours, fast_approx):
+    """
+    Evaluate every truck/cargo pairing in a single pass
+
+    Coordinates are in radians with precomputed latitude cosines, times in epoch seconds
+    and types are integer codes.
+    With fast_approx, pairs closer than FAST_APPROX_MAX_KM use the equirectangular distance.
+
+    Returns:
+        (cost, distance, pickup_sec, waiting_hours, status) arrays of shape (N, M)
+    """
+    num_trucks = t_lat.shape[0]
+    num_cargo = c_lat.shape[0]
+    cost = np.full((num_trucks, num_cargo), np.inf)
+    distance = np.zeros((num_trucks, num_cargo))
+    pickup_sec = np.zeros((num_trucks, num_cargo))
+    waiting_hours = np.zeros((num_trucks, num_cargo))
+    status = np.full((num_trucks, num_cargo), STATUS_TYPE_MISMATCH, dtype=np.int8)
+
+    for i in prange(num_trucks):
+        for j in range(num_cargo):
+            # Type matching check, unknown (negative) types never match
+            if t_type[i] < 0 or t_type[i] != c_type[j]:
+                continue
+
+            dlat = c_lat[j] - t_lat[i]
+            dlon = c_lon[j] - t_lon[i]
+            d = np.inf
+            if fast_approx:
+                # Equirectangular approximation, cos(mean latitude) from the precomputed cosines
+                x = dlon * 0.5 * (t_cos_lat[i] + c_cos_lat[j])
+                d = EARTH_RADIUS_KM * np.sqrt(x * x + dlat * dlat)
+
+            # Haversine distance when the approximation is disabled or the pair is too far apart
+            if d > FAST_APPROX_MAX_KM:
+                a = np.sin(dlat / 2) ** 2 + t_cos_lat[i] * c_cos_lat[j] * np.sin(dlon / 2) ** 2
+                d = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(min(a, 1.0)))
+            distance[i, j] = d
+
+            if d > max_distance_km:
+                status[i, j] = STATUS_TOO_FAR
+                continue
+
+            # Earliest possible time truck can reach cargo location
+            arrival = t_drop_sec[i] + d / speed_kmh * 3600
+            if arrival > c_to_sec[j]:
+                status[i, j] = STATUS_WINDOW_MISSED
+                continue
+
+            # If truck arrives before cargo is available, it must wait
+            wait = max(0.0, (c_from_sec[j] - arrival) / 3600)
+            waiting_hours[i, j] = wait
+            if wait > max_waiting_hours:
+                status[i, j] = STATUS_WAIT_TOO_LONG
+                continue
+
+            status[i, j] = STATUS_VALID
+            pickup_sec[i, j] = max(arrival, c_from_sec[j])
+            cost[i, j] = d * t_ppk[i] + wait * t_pwh[i]
+
+    return cost, distance, pickup_sec, waiting_hours, status
+
+
+def _cost_arrays(t_lat, t_lon, t_cos_lat, t_ppk, t_pwh, t_type, t_drop_sec,
+                 c_lat, c_lon, c_cos_lat, c_type, c_from_sec, c_to_sec,
+                 speed_kmh, max_distance_km, max_waiting_hours, fast_approx):
+    """Branchless NumPy version of _cost_kernel, used when numba is not installed"""
+    distance = distance_matrix_radians(t_lat, t_lon, c_lat, c_lon, fast_approx, t_cos_lat, c_cos_lat)
+
+    # Earliest possible arrival, waiting time and pickup time for every pair
+    arrival = t_drop_sec[:, None] + distance / speed_kmh * 3600
+    waiting_hours = np.maximum(0.0, (c_from_sec[None, :] - arrival) / 3600)
+    pickup_sec = np.maximum(arrival, c_from_sec[None, :])
+
+    # Gates are evaluated as masks, the first failing one determines the status
+    type_match = (t_type[:, None] == c_type[None, :]) & (t_type[:, None] >= 0)
+    status = np.select(
+        [~type_match, distance > max_distance_km, arrival > c_to_sec[None, :], waiting_hours > max_waiting_hours],
+        [STATUS_TYPE_MISMATCH, STATUS_TOO_FAR, STATUS_WINDOW_MISSED, STATUS_WAIT_TOO_LONG],
+        default=STATUS_VALID
+    ).astype(np.int8)
+
+    total_cost = distance * t_ppk[:, None] + waiting_hours * t_pwh[:, None]
+    cost = np.where(status == STATUS_VALID, total_cost, np.inf)
+    return cost, distance, pickup_sec, waiting_hours, status
+
 
 def calculate_cost_matrix(trucks_df, cargo_df, max_distance_km=250, max_waiting_hours=24):
-    """Calculate cost matrix between all trucks and cargo"""
+    """
+    Calculate cost matrix between all trucks and cargo
+
+    Returns:
+        (cost_matrix, distances, pickup_sec, waiting_hours, status) arrays of shape (N, M),
+        followed by the parsed (truck_dropoff, cargo_from, cargo_to) datetime64 arrays
+    """
     calculator = TimeCostCalculator(
         max_distance_km=max_distance_km,
         max_waiting_hours=max_waiting_hours
     )
     num_trucks = len(trucks_df)
-    num_cargo = len(cargo_df)
-    cost_matrix = np.full((num_trucks, num_cargo), np.inf)
+
+    # Case-insensitive type matching is done on shared integer codes
+    type_codes, _ = pd.factorize(np.concatenate([
+        trucks_df['truck type'].str.lower().to_numpy(),
+        cargo_df['Cargo_Type'].str.lower().to_numpy()
+    ]))
+
+    # Pull the columns used per pair into contiguous arrays once
+    t_lat, t_lon, t_cos_lat = radian_coordinates(
+        trucks_df['Latitude (dropoff)'].to_numpy(np.float64),
+        trucks_df['Longitude (dropoff)'].to_numpy(np.float64)
+    )
+    t_ppk = trucks_df['price per km, Eur'].to_numpy(np.float64)
+    t_pwh = trucks_df['waiting time price per h, EUR'].to_numpy(np.float64)
+    t_type = type_codes[:num_trucks]
+    t_drop = _parse_timestamps(trucks_df['Timestamp (dropoff)'])
+    c_lat, c_lon, c_cos_lat = radian_coordinates(
+        cargo_df['Delivery_Latitude'].to_numpy(np.float64),
+        cargo_df['Delivery_Longitude'].to_numpy(np.float64)
+    )
+    c_type = type_codes[num_trucks:]
+    c_from = _parse_timestamps(cargo_df['Available_From'])
+    c_to = _parse_timestamps(cargo_df['Available_To'])
+
+    cost_function = _cost_kernel if JIT_AVAILABLE else _cost_arrays
+    cost_matrix, distances, pickup_sec, waiting, status = cost_function(
+        t_lat, t_lon, t_cos_lat, t_ppk, t_pwh, t_type, _to_epoch_seconds(t_drop),
+        c_lat, c_lon, c_cos_lat, c_type, _to_epoch_seconds(c_from), _to_epoch_seconds(c_to),
+        float(calculator.standard_speed_kmh), float(max_distance_km), float(max_waiting_hours), FAST_APPROX
+    )
+    return cost_matrix, distances, pickup_sec, waiting, status, (t_drop, c_from, c_to)
+
+
+def _gather_pair_metrics(trucks_df, assignments, cost_matrix, distances, waiting):
+    """
+    Gather distance, waiting time and costs of the assigned pairs from the (N, M) matrices
+
+    Returns:
+        Dictionary of arrays of length K, in the order of assignments
+    """
+    rows, cols = np.asarray(assignments, dtype=np.intp).reshape(-1, 2).T
+    distance = distances[rows, cols]
+    waiting_hours = waiting[rows, cols]
+
+    return {
+        'distance': distance,
+        'distance_cost': distance * trucks_df['price per km, Eur'].to_numpy(np.float64)[rows],
+        'waiting_hours': waiting_hours,
+        'waiting_cost': waiting_hours * trucks_df['waiting time price per h, EUR'].to_numpy(np.float64)[rows],
+        'total_cost': cost_matrix[rows, cols]
+    }
+
+
+def _build_time_info(assignments, calculator, pair_metrics, pickup_sec, timestamps):
+    """Gather detailed timing and cost information for the assigned pairs only, times are in UTC"""
+    t_drop, c_from, c_to = timestamps
+
     time_info = {}
+    for k, (i, j) in enumerate(assignments):
+        distance = pair_metrics['distance'][k]
+        waiting_hours = pair_metrics['waiting_hours'][k]
+        pickup_time = pd.Timestamp(pickup_sec[i, j], unit='s', tz='UTC')
+        truck_available = pd.Timestamp(t_drop[i], tz='UTC')
+
+        # Calculate travel time
+        travel_time = calculator.calculate_travel_time(distance)
+
+        time_info[(i, j)] = {
+            'truck_available_from': truck_available,
+            'cargo_available_from': pd.Timestamp(c_from[j], tz='UTC'),
+            'cargo_available_to': pd.Timestamp(c_to[j], tz='UTC'),
+            'travel_to_cargo_hours': travel_time,
+            'waiting_hours': waiting_hours,
+            'pickup_time': pickup_time,
+            'distance': distance,
+            'distance_cost': pair_metrics['distance_cost'][k],
+            'waiting_cost': pair_metrics['waiting_cost'][k],
+            'total_cost': pair_metrics['total_cost'][k],
+            'timeline': {
+                'truck_available': truck_available,
+                'travel_to_cargo_starts': truck_available,
+                'arrival_at_cargo': truck_available + pd.Timedelta(hours=travel_time),
+                'actual_pickup': pickup_time
+            }
+        }
+
+    return time_info
+
+
+def _rejected_pairs(distances, waiting, status):
+    """
+    Compact form of the rejected pairs: (rows, cols, status, distance, waiting_hours)
+    arrays holding only the type-matching pairs that failed a restriction
+    """
+    rows, cols = np.nonzero(status > STATUS_VALID)
+    return rows, cols, status[rows, cols], distances[rows, cols], waiting[rows, cols]
+
+
+def _build_rejection_info(trucks_df, calculator, rejected):
+    """Collect the rejection reason for every pair returned by _rejected_pairs"""
+    t_id = trucks_df['truck_id'].to_numpy()
     rejection_info = {}
 
-    for i, truck in trucks_df.iterrows():
-        for j, cargo in cargo_df.iterrows():
-            # Type matching check (case-insensitive)
-            if truck['truck type'].lower() == cargo['Cargo_Type'].lower():
-                # Calculate distance
-                truck_loc = (truck['Latitude (dropoff)'], truck['Longitude (dropoff)'])
-                cargo_loc = (cargo['Delivery_Latitude'], cargo['Delivery_Longitude'])
-                distance = geodesic(truck_loc, cargo_loc).kilometers
-
-                # Calculate pickup possibilities
-                is_valid, pickup_time, waiting_hours, rejection_reason = calculator.calculate_pickup_possibilities(
-                    truck['Timestamp (dropoff)'],  # This is when truck becomes available
-                    distance,
-                    cargo['Available_From'],
-                    cargo['Available_To']
-                )
-
-                if is_valid:
-                    # Calculate travel time
-                    travel_time = calculator.calculate_travel_time(distance)
-
-                    # Calculate costs
-                    distance_cost = distance * float(truck['price per km, Eur'])
-                    waiting_cost = waiting_hours * float(truck['waiting time price per h, EUR'])
-                    total_cost = distance_cost + waiting_cost
-
-                    # Store valid assignment information
-                    cost_matrix[i, j] = total_cost
-                    time_info[(i, j)] = {
-                        'truck_available_from': pd.to_datetime(truck['Timestamp (dropoff)']),
-                        'cargo_available_from': pd.to_datetime(cargo['Available_From']),
-                        'cargo_available_to': pd.to_datetime(cargo['Available_To']),
-                        'travel_to_cargo_hours': travel_time,
-                        'waiting_hours': waiting_hours,
-                        'pickup_time': pickup_time,
-                        'distance': distance,
-                        'distance_cost': distance_cost,
-                        'waiting_cost': waiting_cost,
-                        'total_cost': total_cost,
-                        'timeline': {
-                            'truck_available': pd.to_datetime(truck['Timestamp (dropoff)']),
-                            'travel_to_cargo_starts': pd.to_datetime(truck['Timestamp (dropoff)']),
-                            'arrival_at_cargo': pd.to_datetime(truck['Timestamp (dropoff)']) + pd.Timedelta(hours=travel_time),
-                            'actual_pickup': pickup_time
-                        }
-                    }
-                else:
-                    rejection_info[(i, j)] = {
-                        'truck_id': truck['truck_id'],
-                        'cargo_id': j,
-                        'distance': distance,
-                        'waiting_hours': waiting_hours,
-                        'reason': rejection_reason
-                    }
-
-    return cost_matrix, time_info, rejection_info
+    for i, j, code, distance, waiting_hours in zip(*(a.tolist() for a in rejected)):
+        rejection_info[(i, j)] = {
+            'truck_id': t_id[i],
+            'cargo_id': j,
+            'distance': distance,
+            'waiting_hours': 0,
+            'reason': calculator.rejection_reason(code, distance, waiting_hours)
+        }
+
+    return rejection_info
 
-def optimize_assignments(trucks_df, cargo_df, max_distance_km=250, max_waiting_hours=24):
+
+@st.cache_data(show_spinner=False)
+def _solve_assignments(trucks_df, cargo_df, max_distance_km, max_waiting_hours):
     """
-    Optimize assignments between trucks and cargo based on total cost
-    Returns list of (truck_idx, cargo_idx) tuples, time information dictionary, and rejection information
+    Cached part of optimize_assignments
+
+    Only compact results are cached: the assignments with their details and the
+    rejected pairs as flat arrays, never the N x M matrices or per-pair dicts.
     """
-    cost_matrix, time_info, rejection_info = calculate_cost_matrix(
+    calculator = TimeCostCalculator(
+        max_distance_km=max_distance_km,
+        max_waiting_hours=max_waiting_hours
+    )
+    cost_matrix, distances, pickup_sec, waiting, status, timestamps = calculate_cost_matrix(
         trucks_df,
         cargo_df,
         max_distance_km=max_distance_km,
         max_waiting_hours=max_waiting_hours
     )
+    rejected = _rejected_pairs(distances, waiting, status)
 
     # Check if any valid assignments exist
     if np.all(np.isinf(cost_matrix)):
-        return [], {}, rejection_info
+        return [], {}, {}, rejected
 
-    # Solve the assignment problem
-    row_ind, col_ind = linear_sum_assignment(np.nan_to_num(cost_matrix, nan=1e10, posinf=1e10))
-
-    # Filter out invalid assignments (infinite cost)
-    valid_assignments = [
-        (r, c) for r, c in zip(row_ind, col_ind)
-        if not np.isinf(cost_matrix[r, c]) and (r, c) in time_info
-    ]
+    # Solve the assignment problem, invalid assignments (infinite cost) are filtered out
+    valid_assignments = solve_assignment(cost_matrix)
 
     if not valid_assignments:
-        return [], {}, rejection_info
+        return [], {}, {}, rejected
+
+    # Detailed information is only needed for the pairs that were actually assigned
+    pair_metrics = _gather_pair_metrics(trucks_df, valid_assignments, cost_matrix, distances, waiting)
+    time_info = _build_time_info(valid_assignments, calculator, pair_metrics, pickup_sec, timestamps)
+
+    return valid_assignments, time_info, pair_metrics, rejected
+
+
+def optimize_assignments(trucks_df, cargo_df, max_distance_km=250, max_waiting_hours=24):
+    """
+    Optimize assignments between trucks and cargo based on total cost
+    Returns list of (truck_idx, cargo_idx) tuples, time information dictionary, rejection information
+    and the per-assignment metric arrays used for the totals
+    """
+    valid_assignments, time_info, pair_metrics, rejected = _solve_assignments(
+        trucks_df,
+        cargo_df,
+        max_distance_km,
+        max_waiting_hours
+    )
+
+    # The rejection dict grows with N x M, so it is rebuilt from the cached arrays on each call
+    calculator = TimeCostCalculator(
+        max_distance_km=max_distance_km,
+        max_waiting_hours=max_waiting_hours
+    )
+    rejection_info = _build_rejection_info(trucks_df, calculator, rejected)
 
-    return valid_assignments, time_info, rejection_info
+    return valid_assignments, time_info, rejection_info, pair_metrics
 
 
-def calculate_total_metrics(assignments, time_info, rejection_info=None):
+def calculate_total_metrics(assignments, pair_metrics, rejection_info=None):
     """
     Calculate total distance, cost, waiting time, and rejection statistics for all assignments
 
     Args:
         assignments: List of (truck_idx, cargo_idx) tuples of valid assignments
-        time_info: Dictionary containing detailed timing and cost information
+        pair_metrics: Dictionary of per-assignment metric arrays from optimize_assignments
         rejection_info: Dictionary containing information about rejected assignments
 
     Returns:
@@ -231,11 +408,11 @@ def calculate_total_metrics(assignments, time_info, rejection_info=None):
         metrics['assignments_count'] = len(assignments)
 
         # Calculate totals
-        total_distance = sum(time_info[a]['distance'] for a in assignments)
-        total_distance_cost = sum(time_info[a]['distance_cost'] for a in assignments)
-        total_waiting_hours = sum(time_info[a]['waiting_hours'] for a in assignments)
-        total_waiting_cost = sum(time_info[a]['waiting_cost'] for a in assignments)
-        total_cost = sum(time_info[a]['total_cost'] for a in assignments)
+        total_distance = float(pair_metrics['distance'].sum())
+        total_distance_cost = float(pair_metrics['distance_cost'].sum())
+        total_waiting_hours = float(pair_metrics['waiting_hours'].sum())
+        total_waiting_cost = float(pair_metrics['waiting_cost'].sum())
+        total_cost = float(pair_metrics['total_cost'].sum())
 
         # Store total metrics
         metrics.update({
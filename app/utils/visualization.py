@@ -1,9 +1,75 @@
 # utils/visualization.py
 import folium
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from folium import plugins
 
+# Builds a Font Awesome marker for each FastMarkerCluster row [lat, lon, popup, tooltip, icon, color]
+MARKER_CALLBACK = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: row[4], prefix: 'fa', markerColor: row[5], iconColor: 'white'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2], {maxWidth: 300});
+    marker.bindTooltip(row[3]);
+    return marker;
+};
+"""
+
+LINE_TOOLTIP_STYLE = "background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;"
+
+
+def point_feature(lat, lon, popup, tooltip):
+    """GeoJSON Point feature carrying the popup and tooltip of its marker"""
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        "properties": {"popup": popup, "tooltip": tooltip}
+    }
+
+
+def line_feature(lat1, lon1, lat2, lon2, **properties):
+    """GeoJSON LineString feature between two points"""
+    return {
+        "type": "Feature",
+        "geometry": {"type": "LineString", "coordinates": [[lon1, lat1], [lon2, lat2]]},
+        "properties": properties
+    }
+
+
+def add_marker_layer(m, features, color, icon):
+    """Add point features to the map as a single GeoJson layer of Font Awesome markers"""
+    if not features:
+        return
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        marker=folium.Marker(icon=folium.Icon(color=color, icon=icon, prefix='fa')),
+        popup=folium.GeoJsonPopup(fields=['popup'], labels=False),
+        tooltip=folium.GeoJsonTooltip(fields=['tooltip'], labels=False)
+    ).add_to(m)
+
+
+def add_line_layer(m, features, fields, aliases, color='green'):
+    """Add line features to the map as a single GeoJson layer with hover tooltips"""
+    if not features:
+        return
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        style_function=lambda x: {
+            'color': color,
+            'weight': 2,
+            'opacity': 0.8
+        },
+        tooltip=folium.GeoJsonTooltip(fields=fields, aliases=aliases, style=LINE_TOOLTIP_STYLE)
+    ).add_to(m)
+
+
+def add_marker_cluster(m, rows, color, icon):
+    """Add [lat, lon, popup, tooltip] rows to the map as one FastMarkerCluster"""
+    if not rows:
+        return
+    plugins.FastMarkerCluster([row + [icon, color] for row in rows], callback=MARKER_CALLBACK).add_to(m)
+
 
 def create_map(trucks_df, cargo_df, assignments, time_info):
     """
@@ -31,17 +97,23 @@ def create_map(trucks_df, cargo_df, assignments, time_info):
     # Add fullscreen option
     plugins.Fullscreen().add_to(m)
 
-    # Track assigned trucks and cargo
-    assigned_trucks = set()
-    assigned_cargo = set()
-
-    # Add lines and markers for assigned pairs
-    for truck_idx, cargo_idx in assignments:
-        assigned_trucks.add(truck_idx)
-        assigned_cargo.add(cargo_idx)
-
-        truck = trucks_df.iloc[truck_idx]
-        cargo = cargo_df.iloc[cargo_idx]
+    # Track assigned trucks and cargo by position
+    truck_assigned = np.zeros(len(trucks_df), dtype=bool)
+    cargo_assigned = np.zeros(len(cargo_df), dtype=bool)
+    truck_assigned[[truck_idx for truck_idx, _ in assignments]] = True
+    cargo_assigned[[cargo_idx for _, cargo_idx in assignments]] = True
+
+    # Markers and lines are collected in one pass and added as a few batched layers
+    truck_features = []
+    cargo_features = []
+    line_features = []
+    unassigned_trucks = []
+    unassigned_cargo = []
+
+    # Collect lines and markers for assigned pairs, rows are gathered once as plain dicts
+    truck_rows = trucks_df.iloc[[truck_idx for truck_idx, _ in assignments]].to_dict('records')
+    cargo_rows = cargo_df.iloc[[cargo_idx for _, cargo_idx in assignments]].to_dict('records')
+    for (truck_idx, cargo_idx), truck, cargo in zip(assignments, truck_rows, cargo_rows):
         assignment_info = time_info[(truck_idx, cargo_idx)]
 
         # Format truck popup
@@ -64,17 +136,12 @@ def create_map(trucks_df, cargo_df, assignments, time_info):
             </div>
         """
 
-        # Add truck marker
-        folium.Marker(
-            location=[truck['Latitude (dropoff)'], truck['Longitude (dropoff)']],
-            popup=folium.Popup(truck_popup, max_width=300),
-            icon=folium.Icon(
-                color='green',
-                icon='truck',
-                prefix='fa'
-            ),
-            tooltip=f"Truck {truck['truck_id']} - Click for details"
-        ).add_to(m)
+        truck_features.append(point_feature(
+            truck['Latitude (dropoff)'],
+            truck['Longitude (dropoff)'],
+            truck_popup,
+            f"Truck {truck['truck_id']} - Click for details"
+        ))
 
         # Format cargo popup
         cargo_popup = f"""
@@ -93,101 +160,87 @@ def create_map(trucks_df, cargo_df, assignments, time_info):
             </div>
         """
 
-        # Add cargo marker
-        folium.Marker(
-            location=[cargo['Delivery_Latitude'], cargo['Delivery_Longitude']],
-            popup=folium.Popup(cargo_popup, max_width=300),
-            icon=folium.Icon(
-                color='green',
-                icon='box',
-                prefix='fa'
-            ),
-            tooltip=f"Cargo {cargo['Cargo_Type']} - Click for details"
-        ).add_to(m)
-
-        # Create connection line with detailed information
-        line_feature = {
-            "type": "Feature",
-            "geometry": {
-                "type": "LineString",
-                "coordinates": [
-                    [truck['Longitude (dropoff)'], truck['Latitude (dropoff)']],
-                    [cargo['Delivery_Longitude'], cargo['Delivery_Latitude']]
-                ]
-            },
-            "properties": {
-                "distance": f"{assignment_info['distance']:.2f} km",
-                "pickup_time": assignment_info['pickup_time'].strftime('%Y-%m-%d %H:%M:%S'),
-                "waiting_time": f"{assignment_info['waiting_hours']:.2f} h",
-                "total_cost": f"€{assignment_info['total_cost']:.2f}"
-            }
-        }
-
-        # Add line with hover effect
-        folium.GeoJson(
-            line_feature,
-            style_function=lambda x: {
-                'color': 'green',
-                'weight': 2,
-                'opacity': 0.8
-            },
-            tooltip=folium.GeoJsonTooltip(
-                fields=['distance', 'pickup_time', 'waiting_time', 'total_cost'],
-                aliases=['Distance:', 'Pickup Time:', 'Waiting Time:', 'Total Cost:'],
-                style=("background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;")
-            )
-        ).add_to(m)
-
-    # Add unassigned trucks
-    for idx, truck in trucks_df.iterrows():
-        if idx not in assigned_trucks:
-            unassigned_truck_popup = f"""
-                <div style='font-family: Arial; min-width: 200px'>
-                    <h4 style='margin-bottom: 10px'>Unassigned Truck</h4>
-                    <b>ID:</b> {truck['truck_id']}<br>
-                    <b>Type:</b> {truck['truck type']}<br>
-                    <b>Location:</b> {truck['Address (drop off)']}<br>
-                    <b>Drop-off Time:</b> {truck['Timestamp (dropoff)']}<br>
-                    <b>Price per km:</b> €{truck['price per km, Eur']}<br>
-                    <b>Waiting price:</b> €{truck['waiting time price per h, EUR']}/h
-                </div>
-            """
-
-            folium.Marker(
-                location=[truck['Latitude (dropoff)'], truck['Longitude (dropoff)']],
-                popup=folium.Popup(unassigned_truck_popup, max_width=300),
-                icon=folium.Icon(
-                    color='red',
-                    icon='truck',
-                    prefix='fa'
-                ),
-                tooltip=f"Unassigned Truck {truck['truck_id']} - Click for details"
-            ).add_to(m)
-
-    # Add unassigned cargo
-    for idx, cargo in cargo_df.iterrows():
-        if idx not in assigned_cargo:
-            unassigned_cargo_popup = f"""
-                <div style='font-family: Arial; min-width: 200px'>
-                    <h4 style='margin-bottom: 10px'>Unassigned Cargo</h4>
-                    <b>Type:</b> {cargo['Cargo_Type']}<br>
-                    <b>From:</b> {cargo['Origin']}<br>
-                    <b>To:</b> {cargo['Delivery_Location']}<br>
-                    <b>Available From:</b> {cargo['Available_From']}<br>
-                    <b>Available To:</b> {cargo['Available_To']}
-                </div>
-            """
-
-            folium.Marker(
-                location=[cargo['Delivery_Latitude'], cargo['Delivery_Longitude']],
-                popup=folium.Popup(unassigned_cargo_popup, max_width=300),
-                icon=folium.Icon(
-                    color='red',
-                    icon='box',
-                    prefix='fa'
-                ),
-                tooltip=f"Unassigned Cargo - Click for details"
-            ).add_to(m)
+        cargo_features.append(point_feature(
+            cargo['Delivery_Latitude'],
+            cargo['Delivery_Longitude'],
+            cargo_popup,
+            f"Cargo {cargo['Cargo_Type']} - Click for details"
+        ))
+
+        # Connection line with detailed information
+        line_features.append(line_feature(
+            truck['Latitude (dropoff)'],
+            truck['Longitude (dropoff)'],
+            cargo['Delivery_Latitude'],
+            cargo['Delivery_Longitude'],
+            distance=f"{assignment_info['distance']:.2f} km",
+            pickup_time=assignment_info['pickup_time'].strftime('%Y-%m-%d %H:%M:%S'),
+            waiting_time=f"{assignment_info['waiting_hours']:.2f} h",
+            total_cost=f"€{assignment_info['total_cost']:.2f}"
+        ))
+
+    # Collect unassigned trucks
+    truck_columns = [
+        'Latitude (dropoff)', 'Longitude (dropoff)', 'truck_id', 'truck type', 'Address (drop off)',
+        'Timestamp (dropoff)', 'price per km, Eur', 'waiting time price per h, EUR'
+    ]
+    for lat, lon, truck_id, truck_type, address, dropoff, price_km, price_waiting in \
+            trucks_df[truck_columns].to_numpy()[~truck_assigned]:
+        unassigned_truck_popup = f"""
+            <div style='font-family: Arial; min-width: 200px'>
+                <h4 style='margin-bottom: 10px'>Unassigned Truck</h4>
+                <b>ID:</b> {truck_id}<br>
+                <b>Type:</b> {truck_type}<br>
+                <b>Location:</b> {address}<br>
+                <b>Drop-off Time:</b> {dropoff}<br>
+                <b>Price per km:</b> €{price_km}<br>
+                <b>Waiting price:</b> €{price_waiting}/h
+            </div>
+        """
+
+        unassigned_trucks.append([
+            lat,
+            lon,
+            unassigned_truck_popup,
+            f"Unassigned Truck {truck_id} - Click for details"
+        ])
+
+    # Collect unassigned cargo
+    cargo_columns = [
+        'Delivery_Latitude', 'Delivery_Longitude', 'Cargo_Type', 'Origin', 'Delivery_Location',
+        'Available_From', 'Available_To'
+    ]
+    for lat, lon, cargo_type, origin, destination, available_from, available_to in \
+            cargo_df[cargo_columns].to_numpy()[~cargo_assigned]:
+        unassigned_cargo_popup = f"""
+            <div style='font-family: Arial; min-width: 200px'>
+                <h4 style='margin-bottom: 10px'>Unassigned Cargo</h4>
+                <b>Type:</b> {cargo_type}<br>
+                <b>From:</b> {origin}<br>
+                <b>To:</b> {destination}<br>
+                <b>Available From:</b> {available_from}<br>
+                <b>Available To:</b> {available_to}
+            </div>
+        """
+
+        unassigned_cargo.append([
+            lat,
+            lon,
+            unassigned_cargo_popup,
+            "Unassigned Cargo - Click for details"
+        ])
+
+    # Add everything as a handful of layers instead of one object per marker
+    add_line_layer(
+        m,
+        line_features,
+        fields=['distance', 'pickup_time', 'waiting_time', 'total_cost'],
+        aliases=['Distance:', 'Pickup Time:', 'Waiting Time:', 'Total Cost:']
+    )
+    add_marker_layer(m, truck_features, color='green', icon='truck')
+    add_marker_layer(m, cargo_features, color='green', icon='box')
+    add_marker_cluster(m, unassigned_trucks, color='red', icon='truck')
+    add_marker_cluster(m, unassigned_cargo, color='red', icon='box')
 
     # Add layer control
     folium.LayerControl().add_to(m)